@@ -0,0 +1,554 @@
+# api.py
+# 🌐 Lightweight JSON metrics API for downstream services
+#
+# Exposes the same price, TVL, volatility, proposal and risk data the
+# Streamlit dashboard shows, backed by a small in-process TTL cache so that
+# many consumers share one set of upstream calls.
+#
+#   python api.py --port 8000
+#
+# Every endpoint takes comma-separated keys for batch queries, e.g.
+#   GET /price?token=aave,uniswap,ethereum
+#   GET /metrics?space=aavedao.eth,ens.eth
+#
+# Every proposal fetched is added to a shared inverted index, searchable via
+#   GET /search?q=emergency,exploit,fork&state=active
+# The index is saved to --index (default proposal_index.json) and reloaded on start.
+#
+# Responses carry a weak ETag (honoured via If-None-Match → 304) and are
+# gzip-compressed when the client sends Accept-Encoding: gzip.
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from market import get_token_price, get_tvl, get_token_price_history
+from snapshot import fetch_proposals
+from upgrade_risk import compute_upgrade_risk
+from protocols import protocol_config, symbol_map
+from proposal_index import ProposalIndex, load_lexicon, RISK_LEXICON_PATH
+
+# ⏱️ Cache lifetimes (seconds) per data source
+CACHE_TTL = {
+    "price": 60,
+    "price_history": 600,
+    "tvl": 300,
+    "tvl_forecast": 3600,
+    "volatility": 3600,
+    "proposals": 120,
+}
+
+ERROR_TTL = 10          # failed upstream calls are retried after this many seconds
+MAX_BATCH = 50          # keys accepted per request
+BATCH_WORKERS = 8       # threads per batch request
+UPSTREAM_TIMEOUT = 20   # seconds a request waits for any one key
+INGEST_LIMIT = 100      # proposals per space fetched for the search index
+INDEX_SAVE_INTERVAL = 60  # seconds between index saves while serving
+GZIP_MIN_BYTES = 512    # smaller bodies are not worth compressing
+
+# Accepted (min, max) for numeric query parameters
+PARAM_BOUNDS = {
+    "days": (1, 365),
+    "periods": (1, 90),
+    "limit": (1, 100),
+}
+
+# Only configured tokens/protocols/spaces are accepted, which keeps the cache bounded
+KNOWN_KEYS = {
+    "token": {c["token"] for c in protocol_config.values()} | set(symbol_map),
+    "protocol": {c["tvl"] for c in protocol_config.values() if c["tvl"]},
+    "space": set(protocol_config),
+}
+
+# Sentiment needs a Twitter token, so the API scores risk with neutral sentiment
+NEUTRAL_SENTIMENT = {"positive": 0, "neutral": 0, "negative": 0}
+
+_cache = {}
+_cache_lock = threading.Lock()
+_cache_only = threading.local()  # set by _batch to try keys inline from the cache
+_key_locks = {}
+_index = ProposalIndex()
+_index_lock = threading.Lock()
+_index_path = None
+_index_saved_at = time.monotonic()
+
+
+class _CacheMiss(Exception):
+    pass
+
+
+def cached(kind, key, compute, failed=None):
+    """
+    Return compute() for (kind, key), reusing the result for CACHE_TTL[kind] seconds
+    (ERROR_TTL if failed(result) is true). Concurrent misses on the same key wait
+    for a single upstream call.
+    """
+    cache_key = (kind, key)
+    entry = _cache.get(cache_key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    if getattr(_cache_only, "active", False):
+        raise _CacheMiss
+
+    with _cache_lock:
+        key_lock = _key_locks.setdefault(cache_key, threading.Lock())
+
+    # Don't queue forever behind a call that is stuck upstream
+    if not key_lock.acquire(timeout=UPSTREAM_TIMEOUT):
+        raise TimeoutError(f"{kind} {key!r} still loading after {UPSTREAM_TIMEOUT}s")
+    try:
+        entry = _cache.get(cache_key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        value = compute()
+        ttl = ERROR_TTL if failed and failed(value) else CACHE_TTL[kind]
+        _cache[cache_key] = (time.monotonic() + ttl, value)
+        return value
+    finally:
+        key_lock.release()
+
+
+# --- Cached computations (JSON-ready) ---
+
+def price(token_id):
+    return cached("price", token_id, lambda: get_token_price(token_id),
+                  failed=lambda v: v["price"] is None)
+
+
+def price_history(token_id, days=30):
+    def compute():
+        df = get_token_price_history(token_id, days=days)
+        if df is None:
+            return None
+        return [
+            {"timestamp": ts.isoformat(), "price": float(p)}
+            for ts, p in df["price"].items()
+        ]
+    return cached("price_history", (token_id, days), compute, failed=lambda v: v is None)
+
+
+def tvl(protocol_slug):
+    return cached("tvl", protocol_slug, lambda: get_tvl(protocol_slug),
+                  failed=lambda v: v["latest"] is None)
+
+
+def tvl_forecast(protocol_slug, periods=5):
+    def compute():
+        try:
+            return _tvl_forecast(protocol_slug, periods)
+        except Exception as e:
+            print("❌ TVL forecast error:", e)
+            return {"forecast": None, "error": str(e)}
+    return cached("tvl_forecast", (protocol_slug, periods), compute, failed=lambda v: v["error"])
+
+
+def _tvl_forecast(protocol_slug, periods):
+    # Prophet is heavy to import, so load it only when a forecast is requested
+    from liquidity import get_tvl_history, forecast_tvl
+
+    history, err = get_tvl_history(protocol_slug)
+    if err:
+        return {"forecast": None, "error": err}
+    forecast, err = forecast_tvl(history, periods=periods)
+    if err:
+        return {"forecast": None, "error": err}
+    return {
+        "forecast": [
+            {
+                "ds": row.ds.isoformat(),
+                "yhat": float(row.yhat),
+                "yhat_lower": float(row.yhat_lower),
+                "yhat_upper": float(row.yhat_upper),
+            }
+            for row in forecast.tail(periods).itertuples()
+        ],
+        "error": None,
+    }
+
+
+def volatility(token_id):
+    symbol = symbol_map.get(token_id)
+    if not symbol:
+        return {"symbol": None, "forecast": None, "mean": None,
+                "error": "Volatility forecast not supported for this token."}
+
+    def compute():
+        try:
+            # yfinance/arch are heavy to import, so load them only when needed
+            from volatility import forecast_volatility
+            future_vol, err = forecast_volatility(symbol=symbol)
+        except Exception as e:
+            print("❌ Volatility forecast error:", e)
+            err = str(e)
+        if err:
+            return {"symbol": symbol, "forecast": None, "mean": None, "error": err}
+        return {
+            "symbol": symbol,
+            "forecast": [float(v) for v in future_vol],
+            "mean": float(future_vol.mean()),
+            "error": None,
+        }
+    return cached("volatility", token_id, compute, failed=lambda v: v["error"])
+
+
+def proposals(space, limit=10):
+    def compute():
+        fetched = fetch_proposals(space, limit)
+        with _index_lock:
+            _index.add_many(fetched, space)
+            if fetched:
+                _save_index(force=False)
+        return fetched
+    # fetch_proposals returns [] on any error
+    return cached("proposals", (space, limit), compute, failed=lambda v: not v)
+
+
+def _save_index(force=True):
+    """Persist the index to _index_path (callers hold _index_lock)."""
+    global _index_saved_at
+    if not _index_path:
+        return
+    if not force and time.monotonic() - _index_saved_at < INDEX_SAVE_INTERVAL:
+        return
+    _index.save(_index_path)
+    _index_saved_at = time.monotonic()
+
+
+def search(query, match="any", state=None, spaces=None, limit=50):
+    """
+    Whole-word search over ingested proposals. The newest INGEST_LIMIT proposals of
+    the requested spaces (all configured spaces by default) are (re)fetched first,
+    subject to the proposals cache.
+    """
+    _batch(spaces or list(protocol_config), lambda s: proposals(s, INGEST_LIMIT))
+    with _index_lock:
+        return _index.search(query, match=match, state=state, spaces=spaces, limit=limit)
+
+
+def risk(space, limit=10):
+    """Risk score for each recent proposal in a space (neutral sentiment, no contract source)."""
+    scored = []
+    for p in proposals(space, limit):
+        score, label = compute_upgrade_risk(
+            contract_metadata={},
+            proposal_data=p,
+            sentiment_score=NEUTRAL_SENTIMENT,
+            risk_lexicon=_index.lexicon
+        )
+        scored.append({"id": p["id"], "title": p["title"], "state": p["state"],
+                       "risk_score": float(score), "risk_label": label})
+    return scored
+
+
+def metrics(space):
+    """Everything the dashboard shows for one governance space."""
+    config = protocol_config.get(space, {})
+    token_id = config.get("token")
+    tvl_id = config.get("tvl")
+    recent = _isolated("risk", risk, space)
+    return {
+        "space": space,
+        "token": token_id,
+        "tvl_slug": tvl_id,
+        "price": _isolated("price", price, token_id) if token_id else None,
+        "tvl": _isolated("tvl", tvl, tvl_id) if tvl_id else None,
+        "volatility": _isolated("volatility", volatility, token_id) if token_id else None,
+        "proposals": recent,
+        "latest_risk": recent[0] if isinstance(recent, list) and recent else None,
+    }
+
+
+def _isolated(name, fn, key):
+    """fn(key), or {"error": ...} so one failing source doesn't fail the whole /metrics entry."""
+    try:
+        return fn(key)
+    except _CacheMiss:
+        raise
+    except Exception as e:
+        print(f"❌ {name} error for {key}:", e)
+        return {"error": str(e)}
+
+
+# --- Routing ---
+
+class BadRequest(Exception):
+    """Invalid query parameters (reported as 400; other errors are 500s)."""
+
+
+def _int_param(params, name, default):
+    """Integer query parameter, clamped to PARAM_BOUNDS[name]."""
+    try:
+        value = int(params.get(name, [default])[0])
+    except ValueError:
+        raise BadRequest(f"'{name}' must be an integer")
+    low, high = PARAM_BOUNDS[name]
+    return max(low, min(value, high))
+
+
+def _keys(params, name, known=True):
+    """Comma-separated batch keys; when known, each must be in KNOWN_KEYS[name]."""
+    raw = ",".join(params.get(name, []))
+    keys = list(dict.fromkeys(k.strip() for k in raw.split(",") if k.strip()))
+    if not keys:
+        raise BadRequest(f"missing '{name}' parameter")
+    if len(keys) > MAX_BATCH:
+        raise BadRequest(f"at most {MAX_BATCH} '{name}' values per request")
+    if known:
+        unknown = [k for k in keys if k not in KNOWN_KEYS[name]]
+        if unknown:
+            raise BadRequest(f"unknown {name}: {', '.join(unknown)} (see /spaces)")
+    return keys
+
+
+def _batch(keys, fn):
+    """
+    Resolve every key concurrently in a pool owned by this request, so one slow
+    upstream cannot starve other requests. Keys that take longer than
+    UPSTREAM_TIMEOUT get an {"error": ...} entry instead of blocking the response.
+    """
+    # Fully cached keys are answered inline without spawning threads
+    results, missing = {}, []
+    _cache_only.active = True
+    try:
+        for key in keys:
+            try:
+                results[key] = fn(key)
+            except _CacheMiss:
+                missing.append(key)
+    finally:
+        _cache_only.active = False
+    if not missing:
+        return results
+
+    executor = ThreadPoolExecutor(max_workers=min(len(missing), BATCH_WORKERS))
+    try:
+        futures = {key: executor.submit(fn, key) for key in missing}
+        done, _ = wait(futures.values(), timeout=UPSTREAM_TIMEOUT)
+        for key, future in futures.items():
+            try:
+                if future not in done:
+                    raise TimeoutError(f"timed out after {UPSTREAM_TIMEOUT}s")
+                results[key] = future.result()
+            except TimeoutError as e:
+                results[key] = {"error": str(e)}
+        return {key: results[key] for key in keys}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _health(params):
+    return {"status": "ok", "time": datetime.utcnow().isoformat()}, 0
+
+
+def _spaces(params):
+    return {"spaces": protocol_config, "symbols": symbol_map}, 3600
+
+
+def _price(params):
+    return _batch(_keys(params, "token"), price), CACHE_TTL["price"]
+
+
+def _price_history(params):
+    days = _int_param(params, "days", 30)
+    return _batch(_keys(params, "token"), lambda t: price_history(t, days)), CACHE_TTL["price_history"]
+
+
+def _tvl(params):
+    return _batch(_keys(params, "protocol"), tvl), CACHE_TTL["tvl"]
+
+
+def _tvl_forecast(params):
+    periods = _int_param(params, "periods", 5)
+    return _batch(_keys(params, "protocol"), lambda s: tvl_forecast(s, periods)), CACHE_TTL["tvl_forecast"]
+
+
+def _volatility(params):
+    return _batch(_keys(params, "token"), volatility), CACHE_TTL["volatility"]
+
+
+def _proposals(params):
+    limit = _int_param(params, "limit", 10)
+    return _batch(_keys(params, "space"), lambda s: proposals(s, limit)), CACHE_TTL["proposals"]
+
+
+def _risk(params):
+    limit = _int_param(params, "limit", 10)
+    return _batch(_keys(params, "space"), lambda s: risk(s, limit)), CACHE_TTL["proposals"]
+
+
+def _search(params):
+    query = _keys(params, "q", known=False)
+    match = params.get("match", ["any"])[0]
+    if match not in ("any", "all"):
+        raise BadRequest("'match' must be 'any' or 'all'")
+    state = params.get("state", [None])[0]
+    if state not in (None, "pending", "active", "closed"):
+        raise BadRequest("'state' must be pending, active or closed")
+    spaces = _keys(params, "space") if "space" in params else None
+    limit = _int_param(params, "limit", 50)
+    return {"results": search(query, match, state, spaces, limit)}, CACHE_TTL["proposals"]
+
+
+def _metrics(params):
+    return _batch(_keys(params, "space"), metrics), CACHE_TTL["price"]
+
+
+ROUTES = {
+    "/health": _health,
+    "/spaces": _spaces,
+    "/price": _price,
+    "/price/history": _price_history,
+    "/tvl": _tvl,
+    "/tvl/forecast": _tvl_forecast,
+    "/volatility": _volatility,
+    "/proposals": _proposals,
+    "/risk": _risk,
+    "/search": _search,
+    "/metrics": _metrics,
+}
+
+
+class UnknownEndpoint(Exception):
+    pass
+
+
+def route(path, params):
+    """Map a request to (payload, max_age). Raises UnknownEndpoint before doing any work."""
+    handler = ROUTES.get(path)
+    if handler is None:
+        raise UnknownEndpoint(path)
+    return handler(params)
+
+
+def make_etag(body):
+    # Weak: the same ETag is valid for the identity and gzip encodings
+    return 'W/"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    if "*" in tags:
+        return True
+    opaque = etag[2:]
+    return any(t == etag or t.removeprefix("W/") == opaque for t in tags)
+
+
+def accepts_gzip(accept_encoding):
+    """True if an Accept-Encoding header allows gzip (honouring q-values)."""
+    qvalues = {}
+    for part in (accept_encoding or "").split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            qvalues[coding.lower()] = q
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qvalues:
+            return qvalues[coding] > 0
+    return False
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive for high-volume clients
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+    server_version = "ProtocolMonitorAPI/1.0"
+    quiet = False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        try:
+            payload, max_age = route(url.path.rstrip("/") or "/", params)
+            status = 200
+        except UnknownEndpoint:
+            payload, max_age, status = {"error": f"unknown endpoint '{url.path}'"}, 0, 404
+        except BadRequest as e:
+            payload, max_age, status = {"error": str(e)}, 0, 400
+        except Exception as e:
+            print("❌ API error:", e)
+            payload, max_age, status = {"error": "internal error"}, 0, 500
+
+        body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode()
+        etag = make_etag(body)
+
+        if status == 200 and etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", f"max-age={max_age}")
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        gzipped = (
+            len(body) >= GZIP_MIN_BYTES
+            and accepts_gzip(self.headers.get("Accept-Encoding"))
+        )
+        if gzipped:
+            body = gzip.compress(body, compresslevel=5)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if status == 200:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", f"max-age={max_age}")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def serve(host="127.0.0.1", port=8000, quiet=False, lexicon_path=None, index_path=None):
+    global _index, _index_path
+    MetricsHandler.quiet = quiet
+    lexicon = load_lexicon(lexicon_path)
+    _index_path = index_path
+    if index_path and os.path.exists(index_path):
+        _index = ProposalIndex.load(index_path, lexicon)
+        print(f"🔎 Loaded {len(_index)} proposals from {index_path}")
+    else:
+        _index = ProposalIndex(lexicon)
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    print(f"🌐 Metrics API listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with _index_lock:
+            _save_index()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Protocol Monitor JSON metrics API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--quiet", action="store_true", help="disable per-request logging")
+    parser.add_argument("--lexicon", default=RISK_LEXICON_PATH,
+                        help="JSON file of risk keyword → weight (default: $RISK_LEXICON_PATH)")
+    parser.add_argument("--index", default="proposal_index.json",
+                        help="file the proposal search index is saved to and loaded from")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.quiet, args.lexicon, args.index)
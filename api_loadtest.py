@@ -0,0 +1,100 @@
+# api_loadtest.py
+# 🏋️ Local load test for api.py
+#
+# Start the API first (python api.py --quiet), then:
+#   python api_loadtest.py --path "/price?token=aave,uniswap" --target 1000
+#
+# The first request warms the cache; the rest measure cached throughput.
+# With --etag the clients send If-None-Match and mostly receive 304s.
+import argparse
+import http.client
+import threading
+import time
+
+
+def worker(host, port, path, headers, deadline, results, lock):
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    ok = errors = 0
+    latencies = []
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status in (200, 304):
+                ok += 1
+            else:
+                errors += 1
+        except Exception:
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+        latencies.append(time.perf_counter() - t0)
+    conn.close()
+    with lock:
+        results["ok"] += ok
+        results["errors"] += errors
+        results["latencies"].extend(latencies)
+
+
+def run(host, port, path, clients, duration, use_etag, use_gzip):
+    headers = {}
+    if use_gzip:
+        headers["Accept-Encoding"] = "gzip"
+
+    # Warm the cache (and grab the ETag) with a single request
+    conn = http.client.HTTPConnection(host, port, timeout=120)
+    conn.request("GET", path, headers=headers)
+    resp = conn.getresponse()
+    resp.read()
+    conn.close()
+    if resp.status != 200:
+        raise SystemExit(f"❌ Warm-up request failed with HTTP {resp.status}")
+    if use_etag:
+        headers["If-None-Match"] = resp.getheader("ETag")
+
+    results = {"ok": 0, "errors": 0, "latencies": []}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=worker, args=(host, port, path, headers, deadline, results, lock))
+        for _ in range(clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(results["latencies"]) or [0.0]
+    return {
+        "rps": results["ok"] / elapsed,
+        "ok": results["ok"],
+        "errors": results["errors"],
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the metrics API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--path", default="/price?token=aave,uniswap,ethereum")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--target", type=float, default=1000.0, help="requests/second to pass")
+    parser.add_argument("--etag", action="store_true", help="send If-None-Match (304 path)")
+    parser.add_argument("--gzip", action="store_true", help="send Accept-Encoding: gzip")
+    args = parser.parse_args()
+
+    stats = run(args.host, args.port, args.path, args.clients, args.duration, args.etag, args.gzip)
+    print(f"📊 {stats['ok']} ok / {stats['errors']} errors in {args.duration:.0f}s "
+          f"→ {stats['rps']:.0f} req/s (p50 {stats['p50_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms)")
+    if stats["rps"] >= args.target and not stats["errors"]:
+        print(f"✅ Target of {args.target:.0f} req/s met")
+    else:
+        print(f"❌ Target of {args.target:.0f} req/s not met")
+        raise SystemExit(1)
@@ -7,6 +7,8 @@ from volatility import forecast_volatility
 from liquidity import get_tvl_history, forecast_tvl
 from sentiment import fetch_and_analyze_sentiment
 from upgrade_risk import compute_upgrade_risk
+from protocols import network_spaces, protocol_config, symbol_map
+from proposal_index import load_lexicon, RISK_LEXICON_PATH
 import pandas as pd
 
 def format_unix(unix_time):
@@ -24,37 +26,9 @@ st.sidebar.caption(f"🔗 Currently selected: `{network}`")
 
 contract_address = st.sidebar.text_input("Enter Smart Contract Address", "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48")
 
-network_spaces = {
-    "Ethereum": ["ens.eth", "aavedao.eth", "uniswapgovernance.eth", "rocketpool-dao.eth"],
-    "Polygon": ["aavedao.eth", "stgdao.eth", "shapeshiftdao.eth", "aavegotchi.eth"],
-    "Arbitrum": ["arbitrumfoundation.eth", "equilibriafi.eth", "stgdao.eth", "shapeshiftdao.eth"]
-}
 available_spaces = network_spaces.get(network, [])
 protocol_space = st.sidebar.selectbox("Select Governance Space", available_spaces)
 
-protocol_config = {
-    "aavedao.eth": {"token": "aave", "tvl": "aave"},
-    "uniswapgovernance.eth": {"token": "uniswap", "tvl": "uniswap"},
-    "rocketpool-dao.eth": {"token": "rocket-pool", "tvl": "rocket-pool"},
-    "ens.eth": {"token": "ethereum", "tvl": None},
-    "stgdao.eth": {"token": "stargate-finance", "tvl": "stargate"},
-    "shapeshiftdao.eth": {"token": "fox-token", "tvl": "shapeshift"},
-    "aavegotchi.eth": {"token": "aavegotchi", "tvl": "aavegotchi"},
-    "arbitrumfoundation.eth": {"token": "arbitrum", "tvl": "arbitrum"},
-    "equilibriafi.eth": {"token": "equilibria", "tvl": "equilibria"},
-}
-symbol_map = {
-    "ethereum": "ETH-USD",
-    "aave": "AAVE-USD",
-    "uniswap": "UNI-USD",
-    "rocket-pool": "RPL-USD",
-    "stargate-finance": "STG-USD",
-    "fox-token": "FOX-USD",
-    "aavegotchi": "GHST-USD",
-    "arbitrum": "ARB-USD",
-    "equilibria": "EQB-USD"
-}
-
 col_left, col_center, col_right = st.columns([1, 2, 1])
 
 with col_left:
@@ -151,7 +125,8 @@ with col_right:
                 risk_score, risk_label = compute_upgrade_risk(
                     contract_metadata=info,
                     proposal_data=latest_proposal,
-                    sentiment_score=sentiment
+                    sentiment_score=sentiment,
+                    risk_lexicon=load_lexicon(RISK_LEXICON_PATH)
                 )
                 st.metric("🚨 Upgrade Risk Score", f"{risk_score}/100", risk_label)
             else:
@@ -0,0 +1,334 @@
+# proposal_index.py
+# 🔎 Inverted full-text index over Snapshot proposal titles and bodies
+#
+# Proposals are tokenized into whole words with light suffix stemming, so
+# "upgrades"/"upgraded" match "upgrade" but "upgradeable" does not. The index
+# is updated incrementally: re-adding a proposal (e.g. when its state moves
+# from active to closed) replaces its old entry, and pending/active states
+# are advanced locally as start/end times pass.
+import json
+import math
+import os
+import re
+import time
+from functools import lru_cache
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Optional JSON lexicon shared by the dashboard and the API
+RISK_LEXICON_PATH = os.getenv("RISK_LEXICON_PATH")
+
+# Bump when tokenization changes so stale saved indexes are rebuilt
+INDEX_VERSION = 2
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# ⚠️ Default risk lexicon: keyword → weight (1.0 = one "hit" in compute_upgrade_risk)
+DEFAULT_RISK_LEXICON = {
+    "upgrade": 1.0,
+    "critical": 1.0,
+    "fork": 1.0,
+    "emergency": 1.0,
+    "vulnerability": 1.0,
+    "exploit": 1.0,
+}
+
+
+def _has_vowel(s):
+    return any(c in "aeiouy" for c in s)
+
+
+@lru_cache(maxsize=100_000)
+def stem(word):
+    """
+    Light suffix stemming: -ies → -y, then -ing / -ed / -s, then -eed → -ee and a
+    trailing -e. Every inflection of a word ends on the same stem:
+    upgrade/upgrades/upgraded/upgrading → "upgrad", speed/speeds → "spe",
+    use/uses/used → "us"; upgradeable is left distinct.
+    """
+    if len(word) <= 2:
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("ing") and len(word) > 5 and _has_vowel(word[:-3]):
+        word = _undouble(word[:-3])
+    elif word.endswith("eed"):
+        pass  # speed/proceed: the -ed is part of the root
+    elif word.endswith("ed") and len(word) > 3 and _has_vowel(word[:-2]):
+        word = _undouble(word[:-2])
+    elif word.endswith("s") and len(word) > 3 and not word.endswith("ss"):
+        word = word[:-1]
+    # speeds → speed → spee → spe, matching speed itself
+    if word.endswith("eed"):
+        word = word[:-1]
+    return word[:-1] if word.endswith("e") and len(word) > 2 else word
+
+
+def _undouble(word):
+    # stopped → stopp → stop
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "aeiouylsz":
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Lower-case, stemmed whole-word tokens of a title/markdown body."""
+    return [stem(t) for t in TOKEN_RE.findall((text or "").lower())]
+
+
+def _restrict(posting, allowed):
+    if len(allowed) < len(posting):
+        return {doc_id for doc_id in allowed if doc_id in posting}
+    return {doc_id for doc_id in posting if doc_id in allowed}
+
+
+def _timestamp(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _state_at(doc, now):
+    """Snapshot state implied by start/end at `now` (only advances pending/active)."""
+    start, end = _timestamp(doc["start"]), _timestamp(doc["end"])
+    if end is not None and now >= end:
+        return "closed"
+    if start is not None and now >= start:
+        return "active"
+    return doc["state"]
+
+
+def validate_lexicon(raw):
+    """
+    Check a {"keyword": weight} mapping and return it lower-cased.
+    Keywords must be a single token (no phrases like "hard fork" or
+    "re-entrancy", which could never match), must not share a stem with another
+    keyword ("upgrade" and "upgrades" would double-count), and weights must be
+    non-negative numbers.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("risk lexicon must be a JSON object of keyword → weight")
+    lexicon = {}
+    stems = {}
+    for kw, w in raw.items():
+        if not isinstance(kw, str) or TOKEN_RE.findall(kw.lower()) != [kw.strip().lower()]:
+            raise ValueError(f"risk keyword {kw!r} must be a single word of letters/digits")
+        if isinstance(w, bool) or not isinstance(w, (int, float)) or not math.isfinite(w) or w < 0:
+            raise ValueError(f"risk keyword {kw!r} has invalid weight {w!r} (need a number >= 0)")
+        kw = kw.strip().lower()
+        other = stems.setdefault(stem(kw), kw)
+        if other != kw:
+            raise ValueError(f"risk keywords {other!r} and {kw!r} match the same words; keep one")
+        lexicon[kw] = float(w)
+    return lexicon
+
+
+def load_lexicon(path=None):
+    """
+    Load a weighted risk lexicon from a JSON file ({"keyword": weight, ...}).
+    Falls back to DEFAULT_RISK_LEXICON when no path is given.
+    """
+    if not path:
+        return dict(DEFAULT_RISK_LEXICON)
+    with open(path) as f:
+        return validate_lexicon(json.load(f))
+
+
+def keyword_score(terms, lexicon=None):
+    """
+    Sum of lexicon weights for the keywords present in an iterable of tokens.
+    Returns (score, sorted list of matched keywords).
+    """
+    lexicon = DEFAULT_RISK_LEXICON if lexicon is None else lexicon
+    present = set(terms)
+    matched = sorted(kw for kw in lexicon if stem(kw) in present)
+    return sum(lexicon[kw] for kw in matched), matched
+
+
+class ProposalIndex:
+    """
+    In-memory inverted index: term → {proposal_id: term frequency}.
+    Also keeps per-state and per-space id sets for cheap query filtering.
+    """
+
+    def __init__(self, lexicon=None):
+        self.lexicon = load_lexicon() if lexicon is None else validate_lexicon(lexicon)
+        self.postings = {}   # term → {doc_id: tf}
+        self.docs = {}       # doc_id → {"space", "title", "state", "start", "end"}
+        self.doc_terms = {}  # doc_id → tuple of terms (for incremental removal)
+        self.by_state = {}   # state → set of doc_ids
+        self.by_space = {}   # space → set of doc_ids
+        self._next_transition = math.inf  # earliest start/end of a pending/active doc
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.docs
+
+    def add(self, proposal, space):
+        """Index (or re-index) one proposal as returned by snapshot.fetch_proposals."""
+        doc_id = proposal["id"]
+        if doc_id in self.docs:
+            self.remove(doc_id)
+
+        counts = {}
+        for term in tokenize(proposal.get("title")) + tokenize(proposal.get("description")):
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+
+        state = proposal.get("state")
+        self.docs[doc_id] = {
+            "space": space,
+            "title": proposal.get("title"),
+            "state": state,
+            "start": proposal.get("start"),
+            "end": proposal.get("end"),
+        }
+        self.doc_terms[doc_id] = tuple(counts)
+        self.by_state.setdefault(state, set()).add(doc_id)
+        self.by_space.setdefault(space, set()).add(doc_id)
+        self._schedule(self.docs[doc_id])
+
+    def _schedule(self, doc):
+        when = {"pending": doc["start"], "active": doc["end"]}.get(doc["state"])
+        when = _timestamp(when)
+        if when is not None and when < self._next_transition:
+            self._next_transition = when
+
+    def refresh_states(self, now=None):
+        """
+        Advance pending → active → closed for proposals whose start/end has
+        passed, so proposals that are no longer re-fetched do not stay "active".
+        Returns the number of proposals whose state changed.
+        """
+        now = time.time() if now is None else now
+        if now < self._next_transition:
+            return 0
+        self._next_transition = math.inf
+        changed = 0
+        for state in ("pending", "active"):
+            for doc_id in list(self.by_state.get(state, ())):
+                doc = self.docs[doc_id]
+                new_state = _state_at(doc, now)
+                if new_state != state:
+                    self.by_state[state].discard(doc_id)
+                    self.by_state.setdefault(new_state, set()).add(doc_id)
+                    doc["state"] = new_state
+                    changed += 1
+                self._schedule(doc)
+        return changed
+
+    def add_many(self, proposals, space):
+        for p in proposals:
+            self.add(p, space)
+
+    def remove(self, doc_id):
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return
+        for term in self.doc_terms.pop(doc_id):
+            posting = self.postings[term]
+            del posting[doc_id]
+            if not posting:
+                del self.postings[term]
+        self.by_state[doc["state"]].discard(doc_id)
+        self.by_space[doc["space"]].discard(doc_id)
+
+    def _candidates(self, terms, match, allowed=None):
+        """Doc ids matching the terms, restricted to `allowed` (probing the smaller side)."""
+        lists = [self.postings.get(t, {}) for t in terms]
+        if match == "all":
+            if not all(lists):
+                return set()
+            lists.sort(key=len)
+            ids = set(lists[0]) if allowed is None else _restrict(lists[0], allowed)
+            for posting in lists[1:]:
+                ids.intersection_update(posting)
+            return ids
+        ids = set()
+        for posting in lists:
+            ids |= set(posting) if allowed is None else _restrict(posting, allowed)
+        return ids
+
+    def search(self, query, match="any", state=None, spaces=None, limit=None):
+        """
+        Find proposals mentioning the query words (whole-word, stemmed).
+
+        Parameters:
+        - query: string or list of words
+        - match: "any" (at least one word) or "all" (every word)
+        - state: optional Snapshot state filter, e.g. "active"
+        - spaces: optional iterable of spaces to restrict to
+
+        Returns a list of dicts sorted by weighted lexicon score, then total
+        term frequency, each with the proposal metadata and matched terms.
+        """
+        if match not in ("any", "all"):
+            raise ValueError("match must be 'any' or 'all'")
+        self.refresh_states()
+        words = query if isinstance(query, (list, tuple, set)) else [query]
+        labels = {}  # stemmed term → the query word it came from
+        for w in words:
+            for raw in TOKEN_RE.findall(w.lower()):
+                labels.setdefault(stem(raw), raw)
+        terms = list(labels)
+        if not terms:
+            return []
+        weights = {stem(kw): w for kw, w in self.lexicon.items()}
+
+        allowed = None
+        if spaces is not None:
+            allowed = set()
+            for space in spaces:
+                allowed |= self.by_space.get(space, set())
+        if state is not None:
+            by_state = self.by_state.get(state, set())
+            allowed = by_state if allowed is None else allowed & by_state
+        ids = self._candidates(terms, match, allowed)
+
+        postings = [(t, self.postings.get(t, {})) for t in terms]
+        results = []
+        for doc_id in ids:
+            matched = [t for t, posting in postings if doc_id in posting]
+            hits = sum(self.postings[t][doc_id] for t in matched)
+            score = sum(weights.get(t, 0.0) for t in matched)
+            results.append({"id": doc_id, **self.docs[doc_id],
+                            "matched": [labels[t] for t in matched], "hits": hits, "score": score})
+        results.sort(key=lambda r: (-r["score"], -r["hits"], r["id"]))
+        return results[:limit] if limit else results
+
+    def risk_keywords(self, doc_id):
+        """(weighted score, matched keywords) from the lexicon for an indexed proposal."""
+        return keyword_score(self.doc_terms.get(doc_id, ()), self.lexicon)
+
+    def save(self, path):
+        """Persist documents and postings as JSON (written atomically)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": INDEX_VERSION, "docs": self.docs, "postings": self.postings}, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, lexicon=None):
+        """Load a saved index; an index saved by another INDEX_VERSION loads empty."""
+        index = cls(lexicon)
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            return index
+        index.docs = data["docs"]
+        index.postings = data["postings"]
+        doc_terms = {}
+        for term, posting in index.postings.items():
+            for doc_id in posting:
+                doc_terms.setdefault(doc_id, []).append(term)
+        for doc_id, doc in index.docs.items():
+            index.doc_terms[doc_id] = tuple(doc_terms.get(doc_id, ()))
+            index.by_state.setdefault(doc["state"], set()).add(doc_id)
+            index.by_space.setdefault(doc["space"], set()).add(doc_id)
+            index._schedule(doc)
+        return index
@@ -0,0 +1,120 @@
+# proposal_index_bench.py
+# ⏱️ Build/query throughput and memory use of ProposalIndex on a synthetic corpus
+#
+#   python proposal_index_bench.py --docs 50000
+#
+# Proposal text is drawn from a Zipf-distributed vocabulary of --vocab words,
+# with the risk keywords (and inflected/derived forms such as "exploited" or
+# "upgradeable") placed at mid-frequency ranks, so posting lists have a
+# realistic long-tail spread. Compares the indexed query against a substring
+# scan over every proposal, which is what compute_upgrade_risk used to do.
+import argparse
+import itertools
+import random
+import string
+import time
+import tracemalloc
+
+from proposal_index import ProposalIndex
+
+SPACES = ["aavedao.eth", "ens.eth", "uniswapgovernance.eth", "rocketpool-dao.eth",
+          "stgdao.eth", "shapeshiftdao.eth", "aavegotchi.eth", "arbitrumfoundation.eth"]
+STATES = ["active"] * 1 + ["closed"] * 8 + ["pending"] * 1
+RISKY = ["upgrade", "upgrades", "upgraded", "upgradeable", "critical", "fork", "forked",
+         "emergency", "vulnerability", "vulnerabilities", "exploit", "exploited"]
+QUERY = ["emergency", "exploit", "fork"]
+
+
+def make_vocabulary(size, rng):
+    """`size` distinct pseudo-words, with the risk words spread over ranks 300–3000."""
+    words = set()
+    while len(words) < size - len(RISKY):
+        length = min(max(int(rng.expovariate(1 / 6)) + 2, 2), 14)
+        words.add("".join(rng.choices(string.ascii_lowercase, k=length)))
+    vocab = sorted(words - set(RISKY))
+    rng.shuffle(vocab)
+    for i, word in enumerate(RISKY):
+        vocab.insert(300 + i * 2700 // len(RISKY), word)
+    return vocab
+
+
+def make_corpus(n, words=300, vocab_size=20000, zipf_s=1.1, seed=7):
+    rng = random.Random(seed)
+    now = int(time.time())
+    vocab = make_vocabulary(vocab_size, rng)
+    cum_weights = list(itertools.accumulate(1 / rank ** zipf_s for rank in range(1, len(vocab) + 1)))
+    corpus = []
+    for i in range(n):
+        length = max(20, int(rng.gauss(words, words / 3)))
+        state = rng.choice(STATES)
+        # Voting window consistent with the state when the query runs
+        start, end = {"pending": (1, 6), "active": (-1, 4), "closed": (-10, -5)}[state]
+        corpus.append((rng.choice(SPACES), {
+            "id": f"0x{i:064x}",
+            "title": " ".join(rng.choices(vocab, cum_weights=cum_weights, k=8)).title(),
+            "state": state,
+            "start": now + start * 86400,
+            "end": now + end * 86400,
+            "description": "## Summary\n" + " ".join(rng.choices(vocab, cum_weights=cum_weights, k=length)),
+        }))
+    return corpus
+
+
+def build(corpus):
+    index = ProposalIndex()
+    for space, p in corpus:
+        index.add(p, space)
+    return index
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the proposal inverted index")
+    parser.add_argument("--docs", type=int, default=50000)
+    parser.add_argument("--words", type=int, default=300, help="mean words per proposal body")
+    parser.add_argument("--vocab", type=int, default=20000, help="distinct words in the corpus")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.docs, args.words, args.vocab)
+    corpus_mb = sum(len(p["title"]) + len(p["description"]) for _, p in corpus) / 1e6
+
+    build_s, index = timed(lambda: build(corpus))
+    postings = sum(len(p) for p in index.postings.values())
+    print(f"🏗️  Build: {args.docs} proposals ({corpus_mb:.0f} MB text) in {build_s:.2f}s "
+          f"→ {args.docs / build_s:,.0f} proposals/s ({len(index.postings):,} terms, {postings:,} postings)")
+
+    # Memory is measured on a second build so tracing does not skew the timing
+    del index
+    tracemalloc.start()
+    index = build(corpus)
+    index_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    print(f"💾 Memory: {index_mb:.0f} MB for the index ({index_mb * 1e3 / args.docs:.1f} KB/proposal)")
+
+    # Incremental update: 1% of proposals close early and are re-ingested
+    updates = [(space, {**p, "state": "closed", "end": p["start"]})
+               for space, p in corpus[:max(args.docs // 100, 1)]]
+    update_s, _ = timed(lambda: [index.add(p, space) for space, p in updates])
+    corpus[:len(updates)] = updates
+    print(f"🔁 Re-index: {len(updates)} proposals in {update_s * 1000:.1f}ms "
+          f"→ {len(updates) / update_s:,.0f} proposals/s")
+
+    query_s, hits = timed(lambda: index.search(QUERY, state="active"), args.queries)
+    print(f"🔎 Query {QUERY} (active, all spaces): {len(hits)} hits, "
+          f"{query_s * 1000:.2f}ms/query → {1 / query_s:,.0f} queries/s")
+
+    def scan():
+        return [p["id"] for _, p in corpus
+                if p["state"] == "active"
+                and any(kw in f"{p['title']} {p['description']}".lower() for kw in QUERY)]
+
+    scan_s, scan_hits = timed(scan, max(args.queries // 100, 1))
+    print(f"🐢 Substring scan baseline: {len(scan_hits)} hits, {scan_s * 1000:.1f}ms/query "
+          f"→ index is {scan_s / query_s:,.0f}x faster")
@@ -0,0 +1,32 @@
+# protocols.py
+# 🗂️ Governance space → market identifiers, shared by the dashboard and the JSON API
+
+network_spaces = {
+    "Ethereum": ["ens.eth", "aavedao.eth", "uniswapgovernance.eth", "rocketpool-dao.eth"],
+    "Polygon": ["aavedao.eth", "stgdao.eth", "shapeshiftdao.eth", "aavegotchi.eth"],
+    "Arbitrum": ["arbitrumfoundation.eth", "equilibriafi.eth", "stgdao.eth", "shapeshiftdao.eth"]
+}
+
+protocol_config = {
+    "aavedao.eth": {"token": "aave", "tvl": "aave"},
+    "uniswapgovernance.eth": {"token": "uniswap", "tvl": "uniswap"},
+    "rocketpool-dao.eth": {"token": "rocket-pool", "tvl": "rocket-pool"},
+    "ens.eth": {"token": "ethereum", "tvl": None},
+    "stgdao.eth": {"token": "stargate-finance", "tvl": "stargate"},
+    "shapeshiftdao.eth": {"token": "fox-token", "tvl": "shapeshift"},
+    "aavegotchi.eth": {"token": "aavegotchi", "tvl": "aavegotchi"},
+    "arbitrumfoundation.eth": {"token": "arbitrum", "tvl": "arbitrum"},
+    "equilibriafi.eth": {"token": "equilibria", "tvl": "equilibria"},
+}
+
+symbol_map = {
+    "ethereum": "ETH-USD",
+    "aave": "AAVE-USD",
+    "uniswap": "UNI-USD",
+    "rocket-pool": "RPL-USD",
+    "stargate-finance": "STG-USD",
+    "fox-token": "FOX-USD",
+    "aavegotchi": "GHST-USD",
+    "arbitrum": "ARB-USD",
+    "equilibria": "EQB-USD"
+}
@@ -33,7 +33,7 @@ def fetch_proposals(space="aavedao.eth", limit=10):
     }
 
     try:
-        resp = requests.post(url, json=query, headers=headers)
+        resp = requests.post(url, json=query, headers=headers, timeout=10)
         resp.raise_for_status()
         data = resp.json()
         proposals = data.get("data", {}).get("proposals") or []
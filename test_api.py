@@ -0,0 +1,228 @@
+import gzip
+import http.client
+import json
+import sys
+import threading
+import types
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import api
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    api._cache.clear()
+    yield
+    api._cache.clear()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(api, "get_token_price",
+                        lambda token_id: {"price": 100.0, "change_24h": 1.5})
+    monkeypatch.setattr(api, "fetch_proposals", lambda space, limit=10: [
+        {"id": f"{space}-{i}", "title": f"Proposal {i}", "state": "closed",
+         "start": 0, "end": 86400, "votes_cast": 10, "voter_count": 5,
+         "description": "Routine parameter change " * 20}
+        for i in range(limit)
+    ])
+    api.MetricsHandler.quiet = True
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), api.MetricsHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(address, path, headers=None):
+    conn = http.client.HTTPConnection(*address, timeout=5)
+    conn.request("GET", path, headers=headers or {})
+    resp = conn.getresponse()
+    body = resp.read()
+    conn.close()
+    return resp, body
+
+
+# --- etag_matches ---
+
+def test_etag_matches_weak_and_strong_forms():
+    etag = api.make_etag(b"{}")
+    opaque = etag[2:]
+    assert api.etag_matches(etag, etag)
+    assert api.etag_matches(opaque, etag)
+
+
+def test_etag_matches_wildcard_and_lists():
+    etag = api.make_etag(b"{}")
+    assert api.etag_matches("*", etag)
+    assert api.etag_matches(f'"other", {etag}', etag)
+    assert not api.etag_matches('W/"other", "another"', etag)
+
+
+def test_etag_matches_missing_header():
+    assert not api.etag_matches(None, api.make_etag(b"{}"))
+    assert not api.etag_matches("", api.make_etag(b"{}"))
+
+
+# --- query parameters ---
+
+def test_keys_splits_and_deduplicates():
+    assert api._keys({"token": ["aave, uniswap", "aave"]}, "token") == ["aave", "uniswap"]
+
+
+def test_keys_rejects_missing_and_oversized_batches():
+    with pytest.raises(api.BadRequest):
+        api._keys({}, "token")
+    too_many = ",".join(f"q{i}" for i in range(api.MAX_BATCH + 1))
+    with pytest.raises(api.BadRequest):
+        api._keys({"q": [too_many]}, "q", known=False)
+
+
+def test_keys_rejects_unknown_values():
+    with pytest.raises(api.BadRequest):
+        api._keys({"space": ["nope.eth"]}, "space")
+
+
+def test_int_param_is_clamped():
+    assert api._int_param({"periods": ["1000000"]}, "periods", 5) == 90
+    assert api._int_param({"limit": ["-3"]}, "limit", 10) == 1
+    with pytest.raises(api.BadRequest):
+        api._int_param({"days": ["abc"]}, "days", 30)
+
+
+def test_accepts_gzip_honours_q_values():
+    assert api.accepts_gzip("gzip, deflate")
+    assert not api.accepts_gzip("gzip;q=0, identity")
+    assert api.accepts_gzip("br, *;q=0.5")
+    assert not api.accepts_gzip("identity")
+
+
+def test_unknown_path_and_internal_key_error_are_distinct(monkeypatch):
+    with pytest.raises(api.UnknownEndpoint):
+        api.route("/nope", {})
+    monkeypatch.setattr(api, "fetch_proposals", lambda space, limit=10: [{"title": "no id"}])
+    with pytest.raises(KeyError):
+        api.route("/risk", {"space": ["ens.eth"]})
+
+
+def test_failed_results_use_short_ttl(monkeypatch):
+    monkeypatch.setattr(api, "fetch_proposals", lambda space, limit=10: [])
+    api.proposals("ens.eth")
+    expires, _ = api._cache[("proposals", ("ens.eth", 10))]
+    assert expires - api.time.monotonic() <= api.ERROR_TTL
+
+
+# --- HTTP ---
+
+def test_conditional_get_returns_304(server):
+    resp, body = get(server, "/price?token=aave,uniswap")
+    assert resp.status == 200
+    assert json.loads(body)["aave"]["price"] == 100.0
+    etag = resp.getheader("ETag")
+
+    resp, body = get(server, "/price?token=aave,uniswap", {"If-None-Match": etag})
+    assert resp.status == 304
+    assert body == b""
+
+
+def test_gzip_only_when_accepted(server):
+    path = "/proposals?space=ens.eth&limit=20"
+    resp, body = get(server, path, {"Accept-Encoding": "gzip"})
+    assert resp.getheader("Content-Encoding") == "gzip"
+    payload = json.loads(gzip.decompress(body))
+    assert len(payload["ens.eth"]) == 20
+
+    resp, body = get(server, path, {"Accept-Encoding": "gzip;q=0, identity"})
+    assert resp.getheader("Content-Encoding") is None
+    assert json.loads(body) == payload
+
+
+def test_errors_map_to_status_codes(server):
+    assert get(server, "/nope")[0].status == 404
+    assert get(server, "/price?token=zzz")[0].status == 400
+
+
+def test_search_ingests_every_configured_space(monkeypatch):
+    now = int(api.time.time())
+    fetched = []
+
+    def fake_fetch(space, limit=10):
+        fetched.append(space)
+        return [{"id": f"{space}-1", "title": "Emergency patch", "state": "active",
+                 "start": now - 10, "end": now + 3600, "description": "exploited bug"}]
+
+    monkeypatch.setattr(api, "fetch_proposals", fake_fetch)
+    monkeypatch.setattr(api, "_index", api.ProposalIndex())
+    payload, _ = api.route("/search", {"q": ["emergency,exploit,fork"], "state": ["active"]})
+    assert sorted(fetched) == sorted(api.protocol_config)
+    assert len(payload["results"]) == len(api.protocol_config)
+    assert payload["results"][0]["matched"] == ["emergency", "exploit"]
+
+
+def test_slow_upstream_key_times_out_without_blocking_others(monkeypatch):
+    release = threading.Event()
+
+    def fake_price(token_id):
+        if token_id == "aave":
+            release.wait(5)
+        return {"price": 1.0, "change_24h": 0.0}
+
+    monkeypatch.setattr(api, "get_token_price", fake_price)
+    monkeypatch.setattr(api, "UPSTREAM_TIMEOUT", 0.2)
+    try:
+        payload, _ = api.route("/price", {"token": ["aave,uniswap"]})
+        assert "timed out" in payload["aave"]["error"]
+        assert payload["uniswap"]["price"] == 1.0
+        # A second request for the stuck key gives up on the key lock too
+        payload, _ = api.route("/price", {"token": ["aave"]})
+        assert "error" in payload["aave"]
+    finally:
+        release.set()
+
+
+def test_volatility_exception_is_cached_as_error(monkeypatch):
+    calls = []
+
+    def broken(symbol):
+        calls.append(symbol)
+        raise RuntimeError("arch fit failed")
+
+    # yfinance/arch may not be installed, so stand in for the whole module
+    monkeypatch.setitem(sys.modules, "volatility", types.SimpleNamespace(forecast_volatility=broken))
+    first = api.volatility("aave")
+    second = api.volatility("aave")
+    assert first == second
+    assert first["error"] == "arch fit failed"
+    assert calls == ["AAVE-USD"]
+    expires, _ = api._cache[("volatility", "aave")]
+    assert expires - api.time.monotonic() <= api.ERROR_TTL
+
+
+def test_metrics_survives_a_failing_source(monkeypatch):
+    monkeypatch.setattr(api, "get_token_price", lambda token_id: {"price": 2.0, "change_24h": 0.0})
+    monkeypatch.setattr(api, "get_tvl", lambda slug: {"latest": 5.0, "change": 0.0})
+    monkeypatch.setattr(api, "volatility", lambda token_id: 1 / 0)
+    monkeypatch.setattr(api, "fetch_proposals", lambda space, limit=10: [])
+    payload, _ = api.route("/metrics", {"space": ["aavedao.eth"]})
+    entry = payload["aavedao.eth"]
+    assert entry["price"]["price"] == 2.0
+    assert "division by zero" in entry["volatility"]["error"]
+
+
+def test_bad_search_params_are_bad_requests():
+    for params in ({"q": ["fork"], "match": ["some"]}, {"q": ["fork"], "state": ["open"]}):
+        with pytest.raises(api.BadRequest):
+            api.route("/search", params)
+
+
+def test_internal_value_error_is_500(server, monkeypatch):
+    def broken(token_id):
+        raise ValueError("could not convert string to float")
+
+    monkeypatch.setattr(api, "get_token_price", broken)
+    resp, body = get(server, "/price?token=aave")
+    assert resp.status == 500
+    assert b"float" not in body
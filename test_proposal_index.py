@@ -0,0 +1,148 @@
+import time
+
+import pytest
+
+from proposal_index import (
+    DEFAULT_RISK_LEXICON, ProposalIndex, keyword_score, load_lexicon, stem, tokenize,
+    validate_lexicon,
+)
+from upgrade_risk import compute_upgrade_risk
+
+NOW = int(time.time())
+
+
+def proposal(doc_id, title="", description="", state="active", start=NOW - 100, end=NOW + 86400):
+    return {"id": doc_id, "title": title, "state": state,
+            "start": start, "end": end, "description": description}
+
+
+def ids(results):
+    return [r["id"] for r in results]
+
+
+# --- tokenization / keyword scoring ---
+
+def test_inflected_forms_count_but_upgradeable_does_not():
+    score, matched = keyword_score(tokenize("Upgrades after exploited vulnerabilities; hard-forked"))
+    assert matched == ["exploit", "fork", "upgrade", "vulnerability"]
+    assert score == 4.0
+    assert keyword_score(tokenize("An upgradeable proxy")) == (0, [])
+
+
+@pytest.mark.parametrize("forms", [
+    ["speed", "speeds", "speeding"],
+    ["proceed", "proceeds", "proceeded"],
+    ["exceed", "exceeds", "exceeded"],
+    ["use", "uses", "used"],
+    ["agree", "agrees", "agreed", "agreeing"],
+    ["stop", "stops", "stopped", "stopping"],
+])
+def test_inflections_share_a_stem(forms):
+    assert len({stem(w) for w in forms}) == 1
+
+
+def test_search_matches_across_ed_root_inflections():
+    index = ProposalIndex()
+    index.add(proposal("a", "Speed bump"), "x.eth")
+    index.add(proposal("b", "Proceeds split"), "x.eth")
+    assert ids(index.search("speeds")) == ["a"]
+    assert ids(index.search("proceed")) == ["b"]
+
+
+def test_compute_upgrade_risk_uses_whole_word_stemmed_keywords():
+    base = {"start": 0, "end": 14 * 86400, "votes_cast": 1, "voter_count": 1}
+    risky, _ = compute_upgrade_risk({}, {**base, "description": "Upgrades after exploited bug, forked"}, {})
+    benign, _ = compute_upgrade_risk({}, {**base, "description": "Upgradeable proxy"}, {})
+    assert risky - benign == pytest.approx(15.0)
+
+
+def test_lexicon_rejects_phrases_and_bad_weights():
+    for bad in ({"hard fork": 2.0}, {"re-entrancy": 1.0}, {"fork": -1}, {"fork": "2"}, {"fork": True}):
+        with pytest.raises(ValueError):
+            validate_lexicon(bad)
+    assert validate_lexicon({"Fork": 2}) == {"fork": 2.0}
+
+
+def test_lexicon_rejects_keywords_with_the_same_stem():
+    with pytest.raises(ValueError):
+        validate_lexicon({"upgrade": 1, "upgrades": 1})
+    with pytest.raises(ValueError):
+        ProposalIndex(lexicon={"Exploit": 1, "exploited": 2})
+
+
+def test_search_score_matches_keyword_score():
+    index = ProposalIndex(lexicon={"upgrade": 1.5, "exploit": 2.0})
+    index.add(proposal("a", "Upgrades after exploited bug"), "x.eth")
+    assert index.search(["upgrade", "exploit"])[0]["score"] == index.risk_keywords("a")[0] == 3.5
+
+
+def test_load_lexicon_defaults_and_file(tmp_path):
+    assert load_lexicon() == DEFAULT_RISK_LEXICON
+    path = tmp_path / "lexicon.json"
+    path.write_text('{"exploit": 3, "rug": 2.5}')
+    assert load_lexicon(str(path)) == {"exploit": 3.0, "rug": 2.5}
+
+
+# --- index maintenance ---
+
+def test_add_and_search_whole_words():
+    index = ProposalIndex()
+    index.add(proposal("a", "Emergency fix", "upgradeable proxy"), "x.eth")
+    index.add(proposal("b", "Routine", "upgrades the oracle"), "y.eth")
+    assert ids(index.search("upgrade")) == ["b"]
+    assert index.search("emergency")[0]["matched"] == ["emergency"]
+
+
+def test_re_add_replaces_old_terms_and_state():
+    index = ProposalIndex()
+    index.add(proposal("a", "Emergency fix"), "x.eth")
+    index.add(proposal("a", "Budget", state="closed", end=NOW - 1), "x.eth")
+    assert len(index) == 1
+    assert index.search("emergency") == []
+    assert ids(index.search("budget", state="closed")) == ["a"]
+    assert index.search("budget", state="active") == []
+
+
+def test_remove_drops_postings():
+    index = ProposalIndex()
+    index.add(proposal("a", "Exploit"), "x.eth")
+    index.remove("a")
+    assert "a" not in index
+    assert index.postings == {}
+    index.remove("a")  # no-op
+
+
+def test_search_filters_and_ranking():
+    index = ProposalIndex(lexicon={"exploit": 3.0, "fork": 1.0})
+    index.add(proposal("a", "Fork fork fork"), "x.eth")
+    index.add(proposal("b", "Exploit"), "y.eth")
+    index.add(proposal("c", "Exploit and fork", state="closed", end=NOW - 1), "x.eth")
+    assert ids(index.search(["fork", "exploit"], state="active")) == ["b", "a"]
+    assert ids(index.search(["fork", "exploit"], match="all")) == ["c"]
+    assert ids(index.search("exploit", spaces=["x.eth"])) == ["c"]
+    assert index.search(["fork"], limit=1)[0]["id"] == "a"
+    with pytest.raises(ValueError):
+        index.search("fork", match="some")
+
+
+def test_refresh_states_advances_by_time():
+    index = ProposalIndex()
+    index.add(proposal("p", "Fork", state="pending", start=NOW + 10, end=NOW + 20), "x.eth")
+    index.add(proposal("a", "Fork", state="active", start=NOW - 10, end=NOW + 5), "x.eth")
+    assert index.refresh_states(NOW) == 0
+    assert index.refresh_states(NOW + 10) == 2
+    assert index.docs["p"]["state"] == "active"
+    assert index.docs["a"]["state"] == "closed"
+    assert index.refresh_states(NOW + 30) == 1
+    assert index.by_state["active"] == set()
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = ProposalIndex()
+    index.add(proposal("a", "Critical exploit", start=NOW - 10, end=2 * NOW), "x.eth")
+    path = str(tmp_path / "index.json")
+    index.save(path)
+    loaded = ProposalIndex.load(path)
+    assert loaded.docs == index.docs
+    assert ids(loaded.search("exploit", state="active")) == ["a"]
+    assert loaded.risk_keywords("a") == (2.0, ["critical", "exploit"])
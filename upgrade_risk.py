@@ -1,8 +1,9 @@
 import re
 import numpy as np
 from datetime import datetime
+from proposal_index import tokenize, keyword_score
 
-def compute_upgrade_risk(contract_metadata, proposal_data, sentiment_score):
+def compute_upgrade_risk(contract_metadata, proposal_data, sentiment_score, risk_lexicon=None):
         """
         Compute a 0-100 risk score for a protocol upgrade based on multiple factors.
         
@@ -10,6 +11,7 @@ def compute_upgrade_risk(contract_metadata, proposal_data, sentiment_score):
         - contract_metadata: dict with fields like 'compiler', 'source_code', etc.
         - proposal_data: dict with 'start', 'end', 'votes_cast', 'voter_count', 'description'
         - sentiment_score: dict with 'positive', 'neutral', 'negative'
+        - risk_lexicon: optional dict of keyword → weight (defaults to DEFAULT_RISK_LEXICON)
 
         Returns:
         - (risk_score: float, category: str)
@@ -41,10 +43,9 @@ def compute_upgrade_risk(contract_metadata, proposal_data, sentiment_score):
         negative_ratio = sentiment_score.get("negative", 0) / total if total else 0
         norm_sentiment = min(negative_ratio * 2, 1.0)
 
-        # --- Feature 5: Risky Keywords ---
-        keywords = ["upgrade", "critical", "fork", "emergency", "vulnerability", "exploit"]
-        description = proposal_data.get("description", "").lower()
-        keyword_hits = sum(1 for kw in keywords if kw in description)
+        # --- Feature 5: Risky Keywords (whole-word, weighted) ---
+        terms = tokenize(proposal_data.get("description", ""))
+        keyword_hits, _ = keyword_score(terms, risk_lexicon)
         norm_keyword = min(keyword_hits / 3, 1.0)
 
         # --- Final Weighted Score ---